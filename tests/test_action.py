@@ -0,0 +1,309 @@
+"""
+Behavior tests for ZRC actions, using an isolated in-process peer session.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+import zenoh
+
+import zrc
+from zrc.exceptions import ZRCError
+
+
+def isolated_config() -> zenoh.Config:
+    """Peer config that neither scouts nor listens, so tests only talk to themselves."""
+    config = zenoh.Config()
+    config.from_json5(json.dumps({
+        "mode": "peer",
+        "scouting": {"multicast": {"enabled": False}},
+        "listen": {"endpoints": []},
+    }))
+    return config
+
+
+@pytest.fixture
+def node():
+    node = zrc.ZRCNode("test_action", config=isolated_config())
+    yield node
+    node.close()
+
+
+def wait_until(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def echo_action(goal_id, goal_data, handle):
+    handle.publish_feedback({"progress": 1})
+    handle.publish_result({"echo": goal_data})
+
+
+class FakeResource:
+    def __init__(self):
+        self.undeclared = 0
+
+    def undeclare(self):
+        self.undeclared += 1
+
+
+def test_resources_do_not_grow_with_goals(node):
+    node.create_action_server("echo", echo_action)
+    client = node.create_action_client("echo")
+
+    goal_id = client.send_goal(0)
+    client.wait_for_result(goal_id, timeout=5.0)
+    baseline = len(node._resources)
+
+    for i in range(50):
+        goal_id = client.send_goal(i, feedback_callback=lambda msg: None)
+        result = client.wait_for_result(goal_id, timeout=5.0)
+        assert result.result == {"echo": i}
+
+    # Only the lazily declared feedback subscriber may have been added
+    assert len(node._resources) <= baseline + 1
+
+
+def test_remove_resource_undeclares_and_untracks(node):
+    resource = FakeResource()
+    node._add_resource(resource)
+    assert id(resource) in node._resources
+
+    node._remove_resource(resource)
+    assert id(resource) not in node._resources
+    assert resource.undeclared == 1
+
+    # Removing an untracked resource is a no-op
+    node._remove_resource(resource)
+    assert resource.undeclared == 1
+
+
+def test_close_empties_resource_table():
+    node = zrc.ZRCNode("test_close", config=isolated_config())
+    resource = FakeResource()
+    node._add_resource(resource)
+    node.create_action_server("echo", echo_action)
+    node.create_action_client("echo")
+
+    node.close()
+    assert node._resources == {}
+    assert resource.undeclared == 1
+
+
+def test_endpoint_close_releases_resources(node):
+    baseline = len(node._resources)
+    server = node.create_action_server("echo", echo_action)
+    client = node.create_action_client("echo")
+    client.send_goal(1, feedback_callback=lambda msg: None)  # Declares the feedback subscriber too
+
+    server.close()
+    client.close()
+    assert len(node._resources) == baseline
+
+
+def test_server_close_cancels_in_flight_goals(node):
+    started = threading.Event()
+    finished = threading.Event()
+    errors = []
+
+    def long_action(goal_id, goal_data, handle):
+        started.set()
+        try:
+            while not handle.is_cancel_requested():
+                handle.publish_feedback({"working": True})
+                time.sleep(0.01)
+            handle.publish_result({"cancelled": True}, zrc.ActionStatus.PREEMPTED)
+        except ZRCError as e:
+            errors.append(e)
+        finally:
+            finished.set()
+
+    server = node.create_action_server("long", long_action)
+    client = node.create_action_client("long")
+    goal_id = client.send_goal(None)
+    assert started.wait(5.0)
+
+    server.close(timeout=5.0)
+    assert finished.is_set()
+    assert errors == []
+    assert client.wait_for_result(goal_id, timeout=5.0).status == zrc.ActionStatus.PREEMPTED
+
+
+def test_run_execute_survives_closed_publishers(node):
+    def failing_action(goal_id, goal_data, handle):
+        raise RuntimeError("boom")
+
+    server = node.create_action_server("failing", failing_action)
+    server._result_pub.close()
+
+    handle = zrc.ActionHandle(node, "g1", "failing", server._feedback_pub, server._result_pub)
+    # Must not raise even though the fallback publish_result fails
+    server._run_execute("g1", None, handle)
+
+
+def test_client_ignores_other_clients_results(node):
+    node.create_action_server("echo", echo_action)
+    ours = node.create_action_client("echo")
+    theirs = node.create_action_client("echo")
+
+    for i in range(5):
+        theirs.wait_for_result(theirs.send_goal(i), timeout=5.0)
+    mine = ours.send_goal("mine")
+
+    assert wait_until(lambda: mine in ours._unclaimed_results)
+    assert list(ours._unclaimed_results) == [mine]
+    assert ours._feedback_sub is None
+    assert ours.wait_for_result(mine, timeout=1.0).result == {"echo": "mine"}
+
+
+def gated_action(gate: threading.Event):
+    def execute(goal_id, goal_data, handle):
+        handle.publish_feedback({"started": goal_data})
+        if goal_data == "slow":
+            gate.wait(5.0)
+        handle.publish_result({"echo": goal_data})
+    return execute
+
+
+def test_send_goals_tracks_statuses_and_results(node):
+    gate = threading.Event()
+    node.create_action_server("batch", gated_action(gate))
+    client = node.create_action_client("batch")
+
+    batch = client.send_goals(["fast", "slow", "fast"])
+    assert len(batch.goal_ids) == 3
+
+    first = batch.wait_any(timeout=5.0)
+    assert first.result == {"echo": "fast"}
+    assert first.status == zrc.ActionStatus.SUCCEEDED
+
+    slow_id = batch.goal_ids[1]
+    assert wait_until(lambda: batch.status(slow_id) == zrc.ActionStatus.ACTIVE)
+    assert not batch.done()
+
+    gate.set()
+    results = batch.wait_all(timeout=5.0)
+    assert batch.done()
+    assert [results[goal_id].result["echo"] for goal_id in batch.goal_ids] == ["fast", "slow", "fast"]
+    assert set(batch.statuses().values()) == {zrc.ActionStatus.SUCCEEDED}
+    assert client._batches == {}
+
+
+def test_batch_wait_timeouts(node):
+    client = node.create_action_client("no_server")
+    batch = client.send_goals([1, 2])
+
+    with pytest.raises(TimeoutError):
+        batch.wait_any(timeout=0.2)
+    with pytest.raises(TimeoutError):
+        batch.wait_all(timeout=0.2)
+    assert set(batch.statuses().values()) == {zrc.ActionStatus.PENDING}
+
+
+def test_send_goals_rejects_empty_list(node):
+    client = node.create_action_client("batch")
+    with pytest.raises(zrc.ActionError):
+        client.send_goals([])
+
+
+def test_server_skips_invalid_batch_entries(node):
+    node.create_action_server("echo", echo_action)
+    client = node.create_action_client("echo")
+
+    client._own_goals.update({"a", "b"})  # Hand-built batch, so register the ids as ours
+    client._goal_pub.publish({"goals": ["not-a-goal", {"goal_id": "a", "data": 1}, 42, {"goal_id": "b", "data": 2}]})
+
+    assert client.wait_for_result("a", timeout=5.0).result == {"echo": 1}
+    assert client.wait_for_result("b", timeout=5.0).result == {"echo": 2}
+
+
+def test_batch_cancel_releases_client_entries(node):
+    client = node.create_action_client("no_server")
+    batch = client.send_goals([1, 2, 3])
+
+    batch.cancel()
+    results = batch.wait_all(timeout=1.0)
+    assert {result.status for result in results.values()} == {zrc.ActionStatus.PREEMPTED}
+    assert client._batches == {}
+    assert client._own_goals == set()
+
+
+def test_client_close_fails_pending_waits(node):
+    client = node.create_action_client("no_server")
+    goal_id = client.send_goal(None)
+    errors = []
+
+    def waiter():
+        try:
+            client.wait_for_result(goal_id, timeout=30.0)
+        except zrc.ActionError as e:
+            errors.append(e)
+
+    t = threading.Thread(target=waiter)
+    t.start()
+    assert wait_until(lambda: goal_id in client._result_futures)
+
+    started = time.time()
+    client.close()
+    t.join(5.0)
+    assert not t.is_alive()
+    assert time.time() - started < 5.0
+    assert len(errors) == 1
+    assert client._result_futures == {}
+
+
+def test_batch_status_active_without_feedback(node):
+    gate = threading.Event()
+
+    def silent_action(goal_id, goal_data, handle):
+        gate.wait(5.0)
+        handle.publish_result({"echo": goal_data})
+
+    node.create_action_server("silent", silent_action)
+    client = node.create_action_client("silent")
+    batch = client.send_goals([1, 2])
+
+    assert wait_until(lambda: set(batch.statuses().values()) == {zrc.ActionStatus.ACTIVE})
+    gate.set()
+    batch.wait_all(timeout=5.0)
+    assert set(batch.statuses().values()) == {zrc.ActionStatus.SUCCEEDED}
+
+
+@pytest.mark.parametrize("goals", ["abc", {"goal_id": "x"}, 7])
+def test_server_rejects_non_list_goals_once(node, capsys, goals):
+    server = node.create_action_server("echo", echo_action)
+    server._handle_goal({"goals": goals})
+
+    lines = [line for line in capsys.readouterr().out.splitlines() if "Invalid goal message" in line]
+    assert len(lines) == 1
+    assert server._active_goals == {}
+
+
+def test_batch_cancel_sends_one_message(node):
+    started = threading.Event()
+
+    def until_cancelled(goal_id, goal_data, handle):
+        started.set()
+        while not handle.is_cancel_requested():
+            time.sleep(0.01)
+        handle.publish_result({"cancelled": True}, zrc.ActionStatus.PREEMPTED)
+
+    server = node.create_action_server("cancellable", until_cancelled)
+    client = node.create_action_client("cancellable")
+    batch = client.send_goals(list(range(20)))
+    assert wait_until(lambda: len(server._active_goals) == 20)
+
+    published = []
+    original_publish = client._cancel_pub.publish
+    client._cancel_pub.publish = lambda msg: (published.append(msg), original_publish(msg))
+
+    batch.cancel()
+    assert len(published) == 1
+    assert sorted(published[0]["goal_ids"]) == sorted(batch.goal_ids)
+    assert wait_until(lambda: server._active_goals == {})
@@ -18,6 +18,7 @@ def test_imports():
     # Test pubsub components
     assert hasattr(zrc, 'Publisher')
     assert hasattr(zrc, 'Subscriber')
+    assert hasattr(zrc, 'WorkerSubscriber')
     
     # Test service components
     assert hasattr(zrc, 'ServiceServer')
@@ -27,6 +28,7 @@ def test_imports():
     assert hasattr(zrc, 'ActionServer')
     assert hasattr(zrc, 'ActionClient')
     assert hasattr(zrc, 'ActionHandle')
+    assert hasattr(zrc, 'ActionBatch')
     assert hasattr(zrc, 'ActionStatus')
     assert hasattr(zrc, 'ActionResult')
     assert hasattr(zrc, 'ActionFeedback')
@@ -0,0 +1,245 @@
+"""
+Behavior tests for ZRC publish/subscribe, including multi-process worker subscribers.
+
+Worker callbacks live at module level so the 'spawn' start method can pickle them.
+"""
+
+import json
+import os
+import socket
+import time
+
+import pytest
+import zenoh
+
+import zrc
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until(predicate, timeout: float = 20.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+@pytest.fixture
+def endpoint():
+    return f"tcp/127.0.0.1:{free_port()}"
+
+
+@pytest.fixture
+def node(endpoint):
+    """Peer node listening on a private endpoint that worker nodes connect back to."""
+    config = zenoh.Config()
+    config.from_json5(json.dumps({
+        "mode": "peer",
+        "scouting": {"multicast": {"enabled": False}},
+        "listen": {"endpoints": [endpoint]},
+    }))
+    node = zrc.ZRCNode("test_pubsub", config=config)
+    yield node
+    node.close()
+
+
+def worker_config(endpoint: str) -> dict:
+    return {
+        "mode": "client",
+        "scouting": {"multicast": {"enabled": False}},
+        "connect": {"endpoints": [endpoint]},
+    }
+
+
+def totals(sub, field: str) -> int:
+    return sum(worker[field] for worker in sub.stats())
+
+
+# --- Worker callbacks (module level for pickling) ---
+
+def tag_with_pid(data):
+    return {"key": data["key"], "seq": data["seq"], "pid": os.getpid()}
+
+
+def reply_dict(data):
+    return {"size": len(data)}
+
+
+def slow(data):
+    time.sleep(0.2)
+
+
+def quick(data):
+    time.sleep(0.02)
+
+
+def explode(data):
+    raise RuntimeError("callback failure")
+
+
+def die(data):
+    os._exit(1)
+
+
+def int_key(payload: bytes):
+    return json.loads(payload)["key"]
+
+
+def warm_up(pub, received, num_workers: int):
+    """Publish one probe per worker until every worker's result reaches the node."""
+    def all_workers_seen():
+        return len({msg["pid"] for msg in received if msg["seq"] < 0}) == num_workers
+
+    deadline = time.time() + 30.0
+    while not all_workers_seen() and time.time() < deadline:
+        for key in range(num_workers):
+            pub.publish({"key": key, "seq": -1})
+        wait_until(all_workers_seen, timeout=0.5)
+    assert all_workers_seen()
+
+
+def test_subscriber_close_releases_resource(node):
+    baseline = len(node._resources)
+    sub = node.create_subscriber("plain", lambda data: None)
+    assert len(node._resources) == baseline + 1
+    sub.close()
+    assert len(node._resources) == baseline
+
+
+@pytest.mark.parametrize("routing", ["key_field", "key_fn"])
+def test_worker_subscriber_preserves_order_per_key(node, endpoint, routing):
+    received = []
+    node.create_subscriber("routed_out", received.append)
+    pub = node.create_publisher("routed_in")
+    keys = {"key_field": "key"} if routing == "key_field" else {"key_fn": int_key}
+    sub = node.create_worker_subscriber("routed_in", tag_with_pid, num_workers=3,
+                                        result_topic="routed_out",
+                                        worker_config=worker_config(endpoint), **keys)
+    try:
+        warm_up(pub, received, 3)
+        for seq in range(30):
+            pub.publish({"key": seq % 5, "seq": seq})
+
+        results = lambda: [msg for msg in received if msg["seq"] >= 0]
+        assert wait_until(lambda: len(results()) == 30)
+        for key in range(5):
+            per_key = [msg for msg in results() if msg["key"] == key]
+            assert len({msg["pid"] for msg in per_key}) == 1
+            assert [msg["seq"] for msg in per_key] == sorted(msg["seq"] for msg in per_key)
+    finally:
+        sub.close()
+
+
+def test_worker_subscriber_unhashable_key_falls_back_to_round_robin(node):
+    pub = node.create_publisher("unhashable")
+    sub = node.create_worker_subscriber("unhashable", quick, num_workers=2, key_field="key")
+    try:
+        for _ in range(4):
+            pub.publish({"key": [1, 2]})
+        assert wait_until(lambda: totals(sub, "processed") == 4)
+        assert [worker["dispatched"] for worker in sub.stats()] == [2, 2]
+    finally:
+        sub.close()
+
+
+def test_worker_subscriber_result_serializer(node, endpoint):
+    received = []
+    node.create_subscriber("raw_out", received.append)
+    pub = node.create_publisher("raw_in", serializer='raw')
+    sub = node.create_worker_subscriber("raw_in", reply_dict, num_workers=1, serializer='raw',
+                                        result_topic="raw_out", worker_config=worker_config(endpoint))
+    try:
+        deadline = time.time() + 30.0
+        while not received and time.time() < deadline:
+            pub.publish(b"abcd")
+            wait_until(lambda: received, timeout=0.5)
+        assert received and received[0] == {"size": 4}
+        assert totals(sub, "errors") == 0
+    finally:
+        sub.close()
+
+
+def test_worker_subscriber_drops_when_full(node):
+    pub = node.create_publisher("backpressure")
+    sub = node.create_worker_subscriber("backpressure", slow, num_workers=1,
+                                        max_pending=1, block_when_full=False)
+    try:
+        for i in range(20):
+            pub.publish({"seq": i})
+        assert wait_until(lambda: totals(sub, "dispatched") + totals(sub, "dropped") == 20)
+        assert totals(sub, "dropped") > 0
+        assert wait_until(lambda: totals(sub, "processed") == totals(sub, "dispatched"))
+    finally:
+        sub.close()
+
+
+def test_worker_subscriber_counts_errors_and_windows_throughput(node):
+    pub = node.create_publisher("failing")
+    sub = node.create_worker_subscriber("failing", explode, num_workers=2)
+    try:
+        for i in range(5):
+            pub.publish({"seq": i})
+        assert wait_until(lambda: totals(sub, "errors") == 5)
+        assert totals(sub, "processed") == 0
+        assert all(worker["alive"] for worker in sub.stats())
+    finally:
+        sub.close()
+
+    quick_pub = node.create_publisher("rates")
+    sub = node.create_worker_subscriber("rates", quick, num_workers=1)
+    try:
+        before_burst = sub.stats()
+        for i in range(5):
+            quick_pub.publish({"seq": i})
+        assert wait_until(lambda: totals(sub, "processed") == 5)
+        after_burst = sub.stats()
+        time.sleep(0.1)
+
+        idle = sub.stats(since=after_burst)[0]
+        assert idle["throughput"] == 0
+        assert idle["average_throughput"] > 0
+        # Other callers reading stats don't shrink this caller's window
+        assert sub.stats(since=before_burst)[0]["throughput"] > 0
+    finally:
+        sub.close()
+
+
+def test_worker_subscriber_close_drains_and_stops_workers(node):
+    baseline = len(node._resources)
+    pub = node.create_publisher("drain")
+    sub = node.create_worker_subscriber("drain", quick, num_workers=2)
+    for i in range(10):
+        pub.publish({"seq": i})
+    assert wait_until(lambda: totals(sub, "dispatched") == 10)
+
+    sub.close()
+    assert not any(worker.is_alive() for worker in sub._workers)
+    assert totals(sub, "processed") == 10
+    assert len(node._resources) == baseline + 1  # Only the publisher is left
+
+
+def test_worker_subscriber_survives_dead_worker(node, capsys):
+    pub = node.create_publisher("dying")
+    sub = node.create_worker_subscriber("dying", die, num_workers=1, max_pending=2)
+    for i in range(10):
+        pub.publish({"seq": i})
+
+    assert wait_until(lambda: not sub.stats()[0]["alive"])
+    assert wait_until(lambda: totals(sub, "dispatched") + totals(sub, "dropped") == 10)
+    assert totals(sub, "dropped") > 0
+    assert totals(sub, "processed") == 0
+
+    # The Zenoh callback thread is not stuck: later samples are still accounted for
+    pub.publish({"seq": 10})
+    assert wait_until(lambda: totals(sub, "dispatched") + totals(sub, "dropped") == 11)
+    assert capsys.readouterr().out.count("died") == 1
+
+    started = time.time()
+    sub.close()
+    assert time.time() - started < 1.0
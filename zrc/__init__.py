@@ -9,9 +9,9 @@ A communication library for robotics based on Zenoh, providing:
 
 from .core import ZRCNode, TopicPrefixes
 from .exceptions import ZRCError, ServiceError, ActionError
-from .pubsub import Publisher, Subscriber
+from .pubsub import Publisher, Subscriber, WorkerSubscriber
 from .service import ServiceServer, ServiceClient
-from .action import ActionServer, ActionClient, ActionHandle, ActionStatus, ActionResult, ActionFeedback
+from .action import ActionServer, ActionClient, ActionHandle, ActionBatch, ActionStatus, ActionResult, ActionFeedback
 
 __version__ = "1.1.0"
 __author__ = "ZRC Contributors"
\ No newline at end of file
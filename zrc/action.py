@@ -7,11 +7,13 @@ import json
 import time
 import threading
 import uuid
-from typing import Any, Callable, Dict, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Union
 from concurrent.futures import Future, TimeoutError
 from dataclasses import dataclass
 from enum import Enum
+from collections import OrderedDict
 from .core import ZRCNode
+from .pubsub import Publisher, Subscriber
 from .exceptions import ActionError, ZRCError
 
 class ActionStatus(Enum):
@@ -38,7 +40,7 @@ class ActionFeedback:
 class ActionHandle:
     """Provides interface for ActionServer callback functions to publish feedback, results and manage cancellation status."""
     def __init__(self, session: ZRCNode, goal_id: str, action_name: str, 
-                 feedback_prefix: str, result_prefix: str, serializer: str = 'json'):
+                 feedback_pub: Publisher, result_pub: Publisher, serializer: str = 'json'):
         self.session = session
         self.goal_id = goal_id
         self.action_name = action_name
@@ -47,11 +49,9 @@ class ActionHandle:
         # Thread event: used to signal execution thread that goal has been cancelled
         self._cancel_event = threading.Event() 
         
-        # Zenoh publishers
-        feedback_key = f"{feedback_prefix}/{goal_id}"
-        result_key = f"{result_prefix}/{goal_id}"
-        self._feedback_pub = session.create_publisher(feedback_key, serializer='json') 
-        self._result_pub = session.create_publisher(result_key, serializer='json') 
+        # Per-action publishers shared by all goals; goal_id travels in the message
+        self._feedback_pub = feedback_pub
+        self._result_pub = result_pub
 
     def set_cancel_requested(self):
         """Called by ActionServer to notify execution thread of cancellation request."""
@@ -76,6 +76,79 @@ class ActionHandle:
         }
         self._result_pub.publish(msg)
 
+class ActionBatch:
+    """Tracks the statuses and results of goals submitted together via ActionClient.send_goals."""
+    def __init__(self, client: "ActionClient", goal_ids: List[str],
+                 feedback_callback: Optional[Callable[[Any], None]] = None):
+        self.client = client
+        self.goal_ids = list(goal_ids)
+        self._feedback_callback = feedback_callback
+        self._statuses: Dict[str, ActionStatus] = {goal_id: ActionStatus.PENDING for goal_id in self.goal_ids}
+        self._results: Dict[str, ActionResult] = {}
+        self._completion_order: List[str] = []
+        self._cond = threading.Condition()
+
+    def status(self, goal_id: str) -> ActionStatus:
+        """Return the last known status of a goal in this batch."""
+        with self._cond:
+            return self._statuses[goal_id]
+
+    def statuses(self) -> Dict[str, ActionStatus]:
+        """Return a snapshot of all goal statuses in this batch."""
+        with self._cond:
+            return dict(self._statuses)
+
+    def results(self) -> Dict[str, ActionResult]:
+        """Return the results received so far, keyed by goal_id."""
+        with self._cond:
+            return dict(self._results)
+
+    def done(self) -> bool:
+        with self._cond:
+            return len(self._results) == len(self.goal_ids)
+
+    def wait_any(self, timeout: float = 30.0) -> ActionResult:
+        """Wait until at least one goal has finished and return the earliest result."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._completion_order, timeout):
+                raise TimeoutError(f"Timeout waiting for any of {len(self.goal_ids)} goals")
+            return self._results[self._completion_order[0]]
+
+    def wait_all(self, timeout: float = 30.0) -> Dict[str, ActionResult]:
+        """Wait until every goal has finished, sharing a single timeout across the batch."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: len(self._results) == len(self.goal_ids), timeout):
+                pending = len(self.goal_ids) - len(self._results)
+                raise TimeoutError(f"Timeout waiting for {pending} of {len(self.goal_ids)} goals")
+            return dict(self._results)
+
+    def cancel(self):
+        """Cancel every goal in the batch that has not finished yet; they are reported as PREEMPTED."""
+        with self._cond:
+            pending = [goal_id for goal_id in self.goal_ids if goal_id not in self._results]
+        self.client.cancel_goals(pending)
+
+    def _on_accepted(self, goal_id: str):
+        with self._cond:
+            if self._statuses.get(goal_id) == ActionStatus.PENDING:
+                self._statuses[goal_id] = ActionStatus.ACTIVE
+
+    def _on_feedback(self, feedback_msg: Dict):
+        with self._cond:
+            if feedback_msg["goal_id"] not in self._results:
+                self._statuses[feedback_msg["goal_id"]] = ActionStatus.ACTIVE
+        if self._feedback_callback:
+            self._feedback_callback(feedback_msg)
+
+    def _on_result(self, result: ActionResult):
+        with self._cond:
+            if result.goal_id in self._results:
+                return
+            self._statuses[result.goal_id] = result.status
+            self._results[result.goal_id] = result
+            self._completion_order.append(result.goal_id)
+            self._cond.notify_all()
+
 class ActionServer:
     def __init__(self, session: ZRCNode, action_name: str, 
                  execute_callback: Callable[[str, Any, ActionHandle], None],
@@ -88,46 +161,91 @@ class ActionServer:
         
         # Store current active ActionHandle instances
         self._active_goals: Dict[str, ActionHandle] = {} 
+        self._goal_threads: Dict[str, threading.Thread] = {}
         self._lock = threading.Lock()  # Thread safety
         
         self._feedback_prefix = f"{session.topic_prefixes.action_feedback}/{action_name}"
         self._result_prefix = f"{session.topic_prefixes.action_result}/{action_name}"
 
+        # Feedback, results and status notices of every goal go out through these shared publishers
+        self._feedback_pub = session.create_publisher(self._feedback_prefix, serializer='json')
+        self._result_pub = session.create_publisher(self._result_prefix, serializer='json')
+        self._status_pub = session.create_publisher(
+            f"{session.topic_prefixes.action_status}/{action_name}", serializer='json')
+
         # 1. Subscribe to goal requests (Goal)
-        self.session.create_subscriber(
+        self._goal_sub = self.session.create_subscriber(
             f"{session.topic_prefixes.action_goal}/{action_name}", 
             self._handle_goal,
             serializer='json'
         )
         
         # 2. Subscribe to cancellation requests (Cancel)
-        self.session.create_subscriber(
+        self._cancel_sub = self.session.create_subscriber(
             f"{session.topic_prefixes.action_cancel}/{action_name}", 
             self._handle_cancel,
             serializer='json'
         )
     
     def _handle_goal(self, goal_msg: Dict):
-        goal_id = goal_msg.get("goal_id")
-        goal_data = goal_msg.get("data")
-        
+        # Batched submission: {"goals": [{"goal_id": ..., "data": ...}, ...]}
+        if "goals" in goal_msg:
+            goals = goal_msg.get("goals")
+            if not isinstance(goals, list):
+                print(f"[{self.action_name} Server] Invalid goal message: 'goals' is not a list")
+                return
+            entries = []
+            for entry in goals:
+                if not isinstance(entry, dict):
+                    print(f"[{self.action_name} Server] Invalid goal message: batch entry is not an object")
+                    continue
+                entries.append((entry.get("goal_id"), entry.get("data")))
+        else:
+            entries = [(goal_msg.get("goal_id"), goal_msg.get("data"))]
+
+        started = []
+        for goal_id, goal_data in entries:
+            t = self._prepare_goal(goal_id, goal_data)
+            if t is not None:
+                started.append((goal_id, t))
+        if not started:
+            return
+
+        # One notice per goal message, so a batch is acknowledged with a single publish
+        status_msg = {
+            "goal_ids": [goal_id for goal_id, _ in started],
+            "status": ActionStatus.ACTIVE.value,
+            "timestamp": time.time()
+        }
+        try:
+            self._status_pub.publish(status_msg)
+        except ZRCError as e:
+            print(f"[{self.action_name} Server] Failed to publish goal status: {e}")
+
+        for _, t in started:
+            t.start()
+
+    def _prepare_goal(self, goal_id: Optional[str], goal_data: Any) -> Optional[threading.Thread]:
+        """Register a goal and return its (not yet started) execution thread."""
         if not goal_id:
             print(f"[{self.action_name} Server] Invalid goal message: missing goal_id")
-            return
+            return None
             
         handle = ActionHandle(
             self.session, goal_id, self.action_name,
-            self._feedback_prefix, self._result_prefix, 
+            self._feedback_pub, self._result_pub, 
             self.data_serializer
         )
         
+        # Execution thread
+        t = threading.Thread(target=self._run_execute, args=(goal_id, goal_data, handle))
+        t.daemon = True
+        
         with self._lock:
             self._active_goals[goal_id] = handle
+            self._goal_threads[goal_id] = t
         
-        # Start execution thread
-        t = threading.Thread(target=self._run_execute, args=(goal_id, goal_data, handle))
-        t.daemon = True
-        t.start()
+        return t
     
     def _run_execute(self, goal_id: str, goal_data: Any, handle: ActionHandle):
         """Wrap execution callback, ensure cleanup after completion"""
@@ -135,15 +253,30 @@ class ActionServer:
             self.execute_callback(goal_id, goal_data, handle)
         except Exception as e:
             print(f"Action execution failed for {goal_id}: {e}")
-            handle.publish_result({"error": str(e)}, ActionStatus.ABORTED)
+            try:
+                handle.publish_result({"error": str(e)}, ActionStatus.ABORTED)
+            except ZRCError as publish_error:
+                print(f"Failed to publish abort result for {goal_id}: {publish_error}")
         finally:
             with self._lock:
                 self._active_goals.pop(goal_id, None)
+                self._goal_threads.pop(goal_id, None)
 
     def _handle_cancel(self, cancel_msg: Dict):
-        goal_id_to_cancel = cancel_msg.get("goal_id") 
+        # Batched cancellation: {"goal_ids": [...]}
+        if "goal_ids" in cancel_msg:
+            goal_ids = cancel_msg.get("goal_ids")
+            if not isinstance(goal_ids, list):
+                print(f"[{self.action_name} Server] Invalid cancel message: 'goal_ids' is not a list")
+                return
+            for goal_id in goal_ids:
+                self._cancel_goal(goal_id)
+            return
 
-        if not goal_id_to_cancel:
+        self._cancel_goal(cancel_msg.get("goal_id"))
+
+    def _cancel_goal(self, goal_id_to_cancel: Optional[str]):
+        if not goal_id_to_cancel or not isinstance(goal_id_to_cancel, str):
             print(f"[{self.action_name} Server] Invalid cancel message: missing goal_id")
             return
 
@@ -155,19 +288,54 @@ class ActionServer:
             else:
                 print(f"[{self.action_name} Server] Cancel request for non-existent goal: {goal_id_to_cancel}")
 
+    def close(self, timeout: float = 5.0):
+        """Stop accepting goals, cancel in-flight goals and release the server's endpoints."""
+        self._goal_sub.close()
+        self._cancel_sub.close()
+
+        # Ask running goals to stop and give them a chance to publish their final result
+        with self._lock:
+            for handle in self._active_goals.values():
+                handle.set_cancel_requested()
+            threads = list(self._goal_threads.values())
+        deadline = time.time() + timeout
+        for t in threads:
+            t.join(max(deadline - time.time(), 0))
+
+        self._feedback_pub.close()
+        self._result_pub.close()
+        self._status_pub.close()
+
 class ActionClient:
+    # Results that arrive before wait_for_result() is called are kept here, bounded
+    _RESULT_CACHE_SIZE = 256
+
     def __init__(self, session: ZRCNode, action_name: str, data_serializer: str = 'json'):
         self.session = session
         self.action_name = action_name
         self.data_serializer = data_serializer
+        self._lock = threading.Lock()
         
         # Publishers
         self._goal_pub = session.create_publisher(f"{session.topic_prefixes.action_goal}/{action_name}", serializer='json')
         self._cancel_pub = session.create_publisher(f"{session.topic_prefixes.action_cancel}/{action_name}", serializer='json')
         
-        # Store goal-related callbacks
+        # Store goal-related callbacks and pending result waiters
         self._goal_callbacks: Dict[str, Dict[str, Optional[Callable]]] = {}
-        self._subscribers: Dict[str, Any] = {}  # Using Any to avoid circular import issues
+        self._result_futures: Dict[str, Future] = {}
+        self._batches: Dict[str, ActionBatch] = {}
+        self._own_goals: Set[str] = set()
+        self._unclaimed_results: "OrderedDict[str, ActionResult]" = OrderedDict()
+
+        # One subscriber per stream for the whole action; messages are routed by goal_id.
+        # The feedback subscriber is declared lazily, once something actually wants feedback.
+        self._feedback_sub: Optional[Subscriber] = None
+        self._status_sub: Optional[Subscriber] = None
+        self._result_sub = session.create_subscriber(
+            f"{session.topic_prefixes.action_result}/{action_name}",
+            self._handle_result,
+            serializer='json'
+        )
 
     def send_goal(self, goal_data: Any, 
                   feedback_callback: Optional[Callable[[Any], None]] = None,
@@ -175,22 +343,16 @@ class ActionClient:
         
         goal_id = str(uuid.uuid4())  # Use uuid4 instead of uuid
         
-        # Create subscribers
-        if feedback_callback:
-            feedback_key = f"{self.session.topic_prefixes.action_feedback}/{self.action_name}/{goal_id}"
-            feedback_sub = self.session.create_subscriber(feedback_key, feedback_callback, serializer='json')
-            self._subscribers[f"feedback_{goal_id}"] = feedback_sub
-            
-        if result_callback:
-            result_key = f"{self.session.topic_prefixes.action_result}/{self.action_name}/{goal_id}"
-            result_sub = self.session.create_subscriber(result_key, result_callback, serializer='json')
-            self._subscribers[f"result_{goal_id}"] = result_sub
-        
         # Store callback references
-        self._goal_callbacks[goal_id] = {
-            'feedback': feedback_callback,
-            'result': result_callback
-        }
+        with self._lock:
+            self._own_goals.add(goal_id)
+            if feedback_callback or result_callback:
+                self._goal_callbacks[goal_id] = {
+                    'feedback': feedback_callback,
+                    'result': result_callback
+                }
+            if feedback_callback:
+                self._ensure_feedback_subscriber()
         
         # Publish goal
         goal_msg = {"goal_id": goal_id, "data": goal_data, "timestamp": time.time()}
@@ -198,44 +360,159 @@ class ActionClient:
         
         return goal_id
 
+    def send_goals(self, goals: List[Any],
+                   feedback_callback: Optional[Callable[[Any], None]] = None) -> ActionBatch:
+        """Submit many goals in a single message and return a handle tracking all of them."""
+        if not goals:
+            raise ActionError("send_goals requires at least one goal")
+
+        goal_ids = [str(uuid.uuid4()) for _ in goals]
+        batch = ActionBatch(self, goal_ids, feedback_callback)
+
+        with self._lock:
+            for goal_id in goal_ids:
+                self._batches[goal_id] = batch
+                self._own_goals.add(goal_id)
+            self._ensure_feedback_subscriber()
+            self._ensure_status_subscriber()
+
+        batch_msg = {
+            "goals": [{"goal_id": goal_id, "data": data} for goal_id, data in zip(goal_ids, goals)],
+            "timestamp": time.time()
+        }
+        self._goal_pub.publish(batch_msg)
+
+        return batch
+
     def cancel_goal(self, goal_id: str):
         """Send request to server to cancel specific goal."""
         cancel_msg = {"goal_id": goal_id, "timestamp": time.time()}
         self._cancel_pub.publish(cancel_msg)
-        
-        # Clean up related subscribers
-        for key_type in ['feedback', 'result']:
-            key = f"{key_type}_{goal_id}"
-            if key in self._subscribers:
-                try:
-                    self._subscribers[key]._subscriber.undeclare()
-                except:
-                    pass
-                del self._subscribers[key]
+        self._release_cancelled([goal_id])
+
+    def cancel_goals(self, goal_ids: List[str]):
+        """Cancel many goals with a single message."""
+        if not goal_ids:
+            return
+        cancel_msg = {"goal_ids": list(goal_ids), "timestamp": time.time()}
+        self._cancel_pub.publish(cancel_msg)
+        self._release_cancelled(goal_ids)
+
+    def _release_cancelled(self, goal_ids: List[str]):
+        # Stop delivering feedback/results for these goals
+        released = []
+        with self._lock:
+            for goal_id in goal_ids:
+                self._goal_callbacks.pop(goal_id, None)
+                self._own_goals.discard(goal_id)
+                released.append((goal_id, self._batches.pop(goal_id, None)))
+
+        # A batch stops tracking the goal here, so record it as preempted rather than wait forever
+        for goal_id, batch in released:
+            if batch is not None:
+                batch._on_result(ActionResult(goal_id=goal_id, status=ActionStatus.PREEMPTED, result=None))
 
     def wait_for_result(self, goal_id: str, timeout: float = 30.0) -> ActionResult:
         """Synchronously wait for result"""
-        future = Future()
-        result_received = threading.Event()
-        
-        def result_handler(data):
-            if isinstance(data, dict) and data.get("goal_id") == goal_id:
-                status = ActionStatus(data.get("status", ActionStatus.SUCCEEDED.value))
-                result = ActionResult(goal_id=goal_id, status=status, result=data.get("data"))
-                future.set_result(result)
-                result_received.set()
-        
-        # Create temporary subscriber
-        result_key = f"{self.session.topic_prefixes.action_result}/{self.action_name}/{goal_id}"
-        temp_sub = self.session.create_subscriber(result_key, result_handler, serializer='json')
+        with self._lock:
+            if goal_id in self._unclaimed_results:
+                return self._unclaimed_results.pop(goal_id)
+            future = self._result_futures.setdefault(goal_id, Future())
         
         try:
-            if result_received.wait(timeout):
-                return future.result(timeout=0.1)
-            else:
-                raise TimeoutError(f"Timeout waiting for result of goal {goal_id}")
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            raise TimeoutError(f"Timeout waiting for result of goal {goal_id}")
         finally:
-            try:
-                temp_sub._subscriber.undeclare()
-            except:
-                pass
\ No newline at end of file
+            with self._lock:
+                if self._result_futures.get(goal_id) is future:
+                    del self._result_futures[goal_id]
+
+    def close(self):
+        """Release the client's endpoints and drop all goal bookkeeping."""
+        for endpoint in (self._feedback_sub, self._status_sub, self._result_sub, self._goal_pub, self._cancel_pub):
+            if endpoint is not None:
+                endpoint.close()
+        with self._lock:
+            self._feedback_sub = None
+            self._status_sub = None
+            futures = list(self._result_futures.values())
+            self._result_futures.clear()
+            self._goal_callbacks.clear()
+            self._batches.clear()
+            self._own_goals.clear()
+            self._unclaimed_results.clear()
+
+        # Wake up threads blocked in wait_for_result() instead of letting them time out
+        for future in futures:
+            if not future.done():
+                future.set_exception(ActionError(f"Action client for {self.action_name} was closed"))
+
+    def _ensure_feedback_subscriber(self):
+        """Declare the shared feedback subscriber on first use. Caller must hold self._lock."""
+        if self._feedback_sub is None:
+            self._feedback_sub = self.session.create_subscriber(
+                f"{self.session.topic_prefixes.action_feedback}/{self.action_name}",
+                self._handle_feedback,
+                serializer='json'
+            )
+
+    def _ensure_status_subscriber(self):
+        """Declare the shared status subscriber on first use. Caller must hold self._lock."""
+        if self._status_sub is None:
+            self._status_sub = self.session.create_subscriber(
+                f"{self.session.topic_prefixes.action_status}/{self.action_name}",
+                self._handle_status,
+                serializer='json'
+            )
+
+    def _handle_status(self, status_msg: Dict):
+        if not isinstance(status_msg, dict) or not isinstance(status_msg.get("goal_ids"), list):
+            return
+        with self._lock:
+            accepted = [(goal_id, self._batches[goal_id]) for goal_id in status_msg["goal_ids"]
+                        if isinstance(goal_id, str) and goal_id in self._batches]
+        for goal_id, batch in accepted:
+            batch._on_accepted(goal_id)
+
+    def _handle_feedback(self, feedback_msg: Dict):
+        if not isinstance(feedback_msg, dict):
+            return
+        goal_id = feedback_msg.get("goal_id")
+        with self._lock:
+            if goal_id not in self._own_goals:
+                return  # Feedback for a goal sent by another client
+            callbacks = self._goal_callbacks.get(goal_id)
+            batch = self._batches.get(goal_id)
+        if batch is not None:
+            batch._on_feedback(feedback_msg)
+        if callbacks and callbacks['feedback']:
+            callbacks['feedback'](feedback_msg)
+
+    def _handle_result(self, result_msg: Dict):
+        if not isinstance(result_msg, dict) or not result_msg.get("goal_id"):
+            return
+        goal_id = result_msg["goal_id"]
+        with self._lock:
+            owned = goal_id in self._own_goals
+            if not owned and goal_id not in self._result_futures:
+                return  # Result for a goal nobody here is waiting on
+        status = ActionStatus(result_msg.get("status", ActionStatus.SUCCEEDED.value))
+        result = ActionResult(goal_id=goal_id, status=status, result=result_msg.get("data"))
+
+        with self._lock:
+            self._own_goals.discard(goal_id)
+            callbacks = self._goal_callbacks.pop(goal_id, None)
+            batch = self._batches.pop(goal_id, None)
+            future = self._result_futures.pop(goal_id, None)
+            if future is None and batch is None and owned:
+                self._unclaimed_results[goal_id] = result
+                while len(self._unclaimed_results) > self._RESULT_CACHE_SIZE:
+                    self._unclaimed_results.popitem(last=False)
+
+        if batch is not None:
+            batch._on_result(result)
+        if future is not None and not future.done():
+            future.set_result(result)
+        if callbacks and callbacks['result']:
+            callbacks['result'](result_msg)
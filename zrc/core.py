@@ -5,7 +5,7 @@ Core components of the ZRC library.
 import zenoh
 import json
 import threading
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional
 from .exceptions import ZRCError
 
 class TopicPrefixes:
@@ -19,6 +19,7 @@ class TopicPrefixes:
         self.action_feedback = f"{base_prefix}/action/feedback"
         self.action_result = f"{base_prefix}/action/result"
         self.action_cancel = f"{base_prefix}/action/cancel"
+        self.action_status = f"{base_prefix}/action/status"
 
 class ZRCNode:
     """
@@ -38,21 +39,24 @@ class ZRCNode:
         except Exception as e:
             raise ZRCError(f"Failed to open Zenoh session: {e}")
 
-        # Track created resources for cleanup
-        self._resources: List[Any] = []
+        # Track created resources for cleanup, keyed by id() for O(1) removal
+        self._resources: Dict[int, Any] = {}
         self._lock = threading.RLock()  # For thread safety
 
     def close(self):
-        """Close Zenoh session and clean up resources."""
+        """
+        Close Zenoh session and clean up resources.
+
+        Resources are released outside the node lock. Worker subscribers stop their
+        processes here, which waits at most their shutdown timeout each.
+        """
         with self._lock:
-            # Clean up all resources
-            for resource in self._resources:
-                try:
-                    if hasattr(resource, 'undeclare'):
-                        resource.undeclare()
-                except Exception:
-                    pass  # Ignore cleanup errors
+            resources = list(self._resources.values())
             self._resources.clear()
+
+        # Clean up all resources
+        for resource in resources:
+            self._release(resource)
         
         try:
             self.session.close()
@@ -62,10 +66,29 @@ class ZRCNode:
     def _add_resource(self, resource):
         """Add resource to tracking list"""
         with self._lock:
-            self._resources.append(resource)
+            self._resources[id(resource)] = resource
+
+    def _remove_resource(self, resource):
+        """Release a tracked resource and stop tracking it."""
+        with self._lock:
+            tracked = self._resources.pop(id(resource), None)
+        if tracked is not None:
+            self._release(tracked)
+
+    @staticmethod
+    def _release(resource):
+        """Shut down a ZRC-level resource, or undeclare a Zenoh entity."""
+        try:
+            if hasattr(resource, 'shutdown'):
+                resource.shutdown()
+            elif hasattr(resource, 'undeclare'):
+                resource.undeclare()
+        except Exception:
+            pass  # Ignore cleanup errors
 
     # --- Helper methods: Serialization ---
-    def _serialize(self, data: Any, serializer: str = 'json') -> bytes:
+    @staticmethod
+    def _serialize(data: Any, serializer: str = 'json') -> bytes:
         """Serialize data to bytes, supporting multiple formats."""
         try:
             if serializer == 'json':
@@ -92,7 +115,8 @@ class ZRCNode:
             raise ZRCError(f"Serialization failed: {e}")
 
     # --- Helper methods: Deserialization ---
-    def _deserialize(self, data: bytes, serializer: str = 'json', message_type: Optional[Any] = None) -> Any:
+    @staticmethod
+    def _deserialize(data: bytes, serializer: str = 'json', message_type: Optional[Any] = None) -> Any:
         """Deserialize bytes to data object."""
         try:
             if serializer == 'json':
@@ -127,6 +151,18 @@ class ZRCNode:
         from .pubsub import Subscriber
         return Subscriber(self, f"{self.topic_prefixes.topic}/{topic_name}", callback, serializer, message_type)
 
+    def create_worker_subscriber(self, topic_name: str, callback, num_workers: int = 2,
+                                 serializer: str = 'json', message_type: Optional[Any] = None,
+                                 key_field: Optional[str] = None, key_fn=None, max_pending: int = 64,
+                                 block_when_full: bool = True, result_topic: Optional[str] = None,
+                                 result_serializer: str = 'json', worker_config: Optional[Dict] = None):
+        from .pubsub import WorkerSubscriber
+        return WorkerSubscriber(self, f"{self.topic_prefixes.topic}/{topic_name}", callback, num_workers,
+                                serializer, message_type, key_field=key_field, key_fn=key_fn,
+                                max_pending=max_pending, block_when_full=block_when_full,
+                                result_topic=result_topic, result_serializer=result_serializer,
+                                worker_config=worker_config)
+
     def create_service_server(self, service_name: str, callback, 
                              serializer: str = 'json', message_type: Optional[Any] = None):
         from .service import ServiceServer
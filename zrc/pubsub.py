@@ -3,8 +3,14 @@ Publisher/Subscriber implementation for ZRC.
 """
 
 import zenoh
-from typing import Any, Callable, Optional
-from .core import ZRCNode
+import itertools
+import json
+import multiprocessing
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from .core import ZRCNode, TopicPrefixes
 from .exceptions import ZRCError
 
 class Publisher:
@@ -23,6 +29,10 @@ class Publisher:
         except Exception as e:
             raise ZRCError(f"Failed to publish to {self.key_expr}: {e}")
 
+    def close(self):
+        """Undeclare the publisher and release it from the node."""
+        self.session._remove_resource(self._publisher)
+
 class Subscriber:
     def __init__(self, session: ZRCNode, key_expr: str, callback: Callable[[Any], None],
                  serializer: str = 'json', message_type: Optional[Any] = None):
@@ -38,4 +48,242 @@ class Subscriber:
         self.session = session
         self.key_expr = key_expr
         self._subscriber = session.session.declare_subscriber(key_expr, zenoh_callback)
-        session._add_resource(self._subscriber)
\ No newline at end of file
+        session._add_resource(self._subscriber)
+
+    def close(self):
+        """Undeclare the subscriber and release it from the node."""
+        self.session._remove_resource(self._subscriber)
+
+def _worker_main(index: int, task_queue, callback: Callable[[Any], Any],
+                 serializer: str, message_type: Optional[Any],
+                 result_topic: Optional[str], result_serializer: str,
+                 worker_config: Optional[Dict], topic_prefixes: TopicPrefixes, processed, errors):
+    """Entry point of a WorkerSubscriber process: deserialize payloads and run the callback."""
+    node = None
+    result_pub = None
+    if result_topic:
+        # zenoh.Config cannot be pickled, so workers receive a plain dict and build their own
+        config = zenoh.Config()
+        if worker_config:
+            config.from_json5(json.dumps(worker_config))
+        node = ZRCNode(f"zrc_worker_{index}", config=config, topic_prefixes=topic_prefixes)
+        result_pub = node.create_publisher(result_topic, result_serializer)
+
+    try:
+        while True:
+            payload = task_queue.get()
+            if payload is None:  # Shutdown sentinel
+                break
+            try:
+                data = ZRCNode._deserialize(payload, serializer, message_type)
+                result = callback(data)
+                if result_pub is not None and result is not None:
+                    result_pub.publish(result)
+                with processed.get_lock():
+                    processed[index] += 1
+            except Exception as e:
+                with errors.get_lock():
+                    errors[index] += 1
+                print(f"Error in worker {index} callback: {e}")  # Log error but keep worker alive
+    finally:
+        if node is not None:
+            node.close()
+
+class WorkerSubscriber:
+    """
+    Subscriber that fans raw payloads out to a pool of worker processes.
+
+    Deserialization and the callback run inside the workers, so CPU-bound callbacks
+    are not limited by the GIL. Workers are started with the 'spawn' method, which
+    means ``callback`` and ``message_type`` must be picklable (module-level functions).
+
+    Routing is round-robin unless a key is given, in which case payloads with the same
+    key always go to the same worker. ``key_fn`` is called on the raw payload bytes in
+    the subscribing process and should be cheap. ``key_field`` is a convenience that
+    fully deserializes every payload in the subscribing process just to read the field,
+    which costs one extra decode per message under the GIL; prefer ``key_fn`` for
+    heavy payloads. Payloads whose key cannot be extracted or hashed fall back to
+    round-robin.
+
+    A blocked dispatch re-checks the target worker at this interval, so a worker that
+    dies never leaves the Zenoh callback thread stuck; its messages count as dropped.
+    """
+    _PUT_POLL_INTERVAL = 0.1
+
+    def __init__(self, session: ZRCNode, key_expr: str, callback: Callable[[Any], Any],
+                 num_workers: int = 2, serializer: str = 'json', message_type: Optional[Any] = None,
+                 key_field: Optional[str] = None, key_fn: Optional[Callable[[bytes], Hashable]] = None,
+                 max_pending: int = 64, block_when_full: bool = True,
+                 result_topic: Optional[str] = None, result_serializer: str = 'json',
+                 worker_config: Optional[Dict] = None):
+        if num_workers < 1:
+            raise ZRCError("WorkerSubscriber requires at least one worker")
+
+        self.session = session
+        self.key_expr = key_expr
+        self.num_workers = num_workers
+        self.serializer = serializer
+        self.message_type = message_type
+        self.key_field = key_field
+        self.key_fn = key_fn
+        self.block_when_full = block_when_full
+
+        ctx = multiprocessing.get_context('spawn')
+        self._processed = ctx.Array('Q', num_workers)
+        self._errors = ctx.Array('Q', num_workers)
+        self._dispatched = [0] * num_workers
+        self._dropped = [0] * num_workers
+        self._stats_lock = threading.Lock()
+        self._round_robin = itertools.cycle(range(num_workers))
+        self._started_at = time.time()
+        self._reported_dead = set()
+        self._closed = False
+
+        # Bounded queues: a full queue blocks (or drops, see block_when_full) the Zenoh callback
+        self._queues = [ctx.Queue(maxsize=max_pending) for _ in range(num_workers)]
+        self._workers = []
+        for index, task_queue in enumerate(self._queues):
+            worker = ctx.Process(
+                target=_worker_main,
+                args=(index, task_queue, callback, serializer, message_type, result_topic,
+                      result_serializer, worker_config, session.topic_prefixes,
+                      self._processed, self._errors),
+                daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+        def zenoh_callback(sample: zenoh.Sample):
+            try:
+                self._dispatch(sample.payload.to_bytes())
+            except Exception as e:
+                print(f"Error dispatching to subscriber workers: {e}")  # Log error but don't interrupt
+
+        self._subscriber = session.session.declare_subscriber(key_expr, zenoh_callback)
+        session._add_resource(self._subscriber)
+        session._add_resource(self)
+
+    def _extract_key(self, payload: bytes) -> Optional[Hashable]:
+        if self.key_fn is not None:
+            return self.key_fn(payload)
+        data = self.session._deserialize(payload, self.serializer, self.message_type)
+        if isinstance(data, dict):
+            return data.get(self.key_field)
+        return getattr(data, self.key_field, None)
+
+    def _select_worker(self, payload: bytes) -> int:
+        """Pick a worker by key hash so per-key ordering holds, otherwise round-robin."""
+        if self.key_fn is not None or self.key_field is not None:
+            try:
+                key = self._extract_key(payload)
+                if key is not None:
+                    return hash(key) % self.num_workers
+            except Exception:
+                pass  # Unkeyable payload (bad data, unhashable key): fall back to round-robin
+        with self._stats_lock:
+            return next(self._round_robin)
+
+    def _dispatch(self, payload: bytes):
+        index = self._select_worker(payload)
+        task_queue = self._queues[index]
+        worker = self._workers[index]
+
+        # Count before queueing so a fast worker can never make 'pending' negative
+        with self._stats_lock:
+            self._dispatched[index] += 1
+
+        delivered = False
+        if not self.block_when_full:
+            try:
+                task_queue.put_nowait(payload)
+                delivered = worker.is_alive()
+            except queue.Full:
+                pass
+        else:
+            # Block for backpressure, but never on a dead worker or a closed subscriber
+            while not self._closed and worker.is_alive():
+                try:
+                    task_queue.put(payload, timeout=self._PUT_POLL_INTERVAL)
+                    delivered = True
+                    break
+                except queue.Full:
+                    continue
+
+        if delivered:
+            return
+        with self._stats_lock:
+            self._dispatched[index] -= 1
+            self._dropped[index] += 1
+            report_death = not worker.is_alive() and index not in self._reported_dead
+            if report_death:
+                self._reported_dead.add(index)
+        if report_death:
+            print(f"Subscriber worker {index} for {self.key_expr} died "
+                  f"(exit code {worker.exitcode}); dropping its messages")
+
+    def stats(self, since: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Return per-worker counters and processing rates.
+
+        Pass the result of an earlier ``stats()`` call as ``since`` to get ``throughput``
+        over that window, so a worker that has just fallen behind shows up immediately.
+        Without it ``throughput`` covers the subscriber's whole lifetime, like
+        ``average_throughput``. Nothing is reset, so independent callers don't interfere.
+        """
+        now = time.time()
+        processed_counts = list(self._processed)
+        error_counts = list(self._errors)
+        with self._stats_lock:
+            dispatched = list(self._dispatched)
+            dropped = list(self._dropped)
+        lifetime = max(now - self._started_at, 1e-9)
+        stats = []
+        for index in range(self.num_workers):
+            processed = processed_counts[index]
+            if since is not None:
+                window = max(now - since[index]["timestamp"], 1e-9)
+                throughput = (processed - since[index]["processed"]) / window
+            else:
+                throughput = processed / lifetime
+            stats.append({
+                "worker": index,
+                "timestamp": now,
+                "alive": self._workers[index].is_alive(),
+                "dispatched": dispatched[index],
+                "processed": processed,
+                "errors": error_counts[index],
+                "dropped": dropped[index],
+                "pending": max(dispatched[index] - processed - error_counts[index], 0),
+                "throughput": throughput,
+                "average_throughput": processed / lifetime,
+            })
+        return stats
+
+    def shutdown(self, timeout: float = 5.0):
+        """
+        Stop the worker processes, letting them drain already queued payloads.
+
+        Waits at most ``timeout`` seconds in total; workers still running after that
+        are terminated.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        deadline = time.time() + timeout
+        for task_queue, worker in zip(self._queues, self._workers):
+            if not worker.is_alive():
+                continue  # Nobody left to read the sentinel
+            try:
+                task_queue.put(None, timeout=max(deadline - time.time(), 0))
+            except queue.Full:
+                pass
+        for worker in self._workers:
+            worker.join(max(deadline - time.time(), 0))
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+
+    def close(self):
+        """Undeclare the subscriber, stop the workers and release them from the node."""
+        self.session._remove_resource(self._subscriber)
+        self.session._remove_resource(self)